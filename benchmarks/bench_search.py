@@ -0,0 +1,49 @@
+"""
+Benchmark of the number of nodes and of the time needed to search a fixed suite of positions up to a given depth,
+with the plain alpha-beta search and with iterative deepening + aspiration windows + Principal Variation Search.
+
+Usage : python -m benchmarks.bench_search [depth]
+"""
+import os
+import random
+import sys
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from src.murus_gallicus.minimax import MinimaxAI
+from benchmarks.positions import create_position_suite
+
+
+def run_plain(game, depth):
+    ai = MinimaxAI(depth)
+    ai.play_minimax(game.board, depth, True, game)
+    return ai.stats
+
+
+def run_iterative(game, depth, pvs):
+    ai = MinimaxAI(depth, pvs=pvs)
+    ai.search(game.board, game, depth)
+    return ai.stats
+
+
+def main(depth=3):
+    suite = create_position_suite()
+    modes = [("alpha-beta", lambda game: run_plain(game, depth)),
+             ("iterative + aspiration", lambda game: run_iterative(game, depth, False)),
+             ("iterative + aspiration + PVS", lambda game: run_iterative(game, depth, True))]
+    print("Search of {} positions up to depth {}".format(len(suite), depth))
+    print("{:<30} {:>10} {:>12} {:>10} {:>10}".format("mode", "nodes", "q-nodes", "research", "time (s)"))
+    for name, run in modes:
+        random.seed(0)
+        nodes = quiescence_nodes = researches = 0
+        start = time.perf_counter()
+        for game in suite:
+            stats = run(game)
+            nodes += stats["nodes"]
+            quiescence_nodes += stats["quiescence_nodes"]
+            researches += stats["researches"] + stats["aspiration_researches"]
+        elapsed = time.perf_counter() - start
+        print("{:<30} {:>10} {:>12} {:>10} {:>10.2f}".format(name, nodes, quiescence_nodes, researches, elapsed))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,42 @@
+import random
+from src.murus_gallicus.game import Game
+from src.murus_gallicus.minimax import MinimaxAI
+from src.murus_gallicus.constants import WINDOW, CELTIC_GREEN
+
+
+def create_position_suite(nb_positions=12, min_plies=4, max_plies=20, seed=2021):
+    """
+    Creates a fixed suite of game positions by playing random actions from the starting position.
+
+    Parameters
+    ----------
+    nb_positions : int
+        Number of positions of the suite.
+    min_plies : int
+        Minimal number of random actions played from the starting position.
+    max_plies : int
+        Maximal number of random actions played from the starting position.
+    seed : int
+        Seed of the random actions, so that the suite is the same at each run.
+
+    Returns
+    -------
+    games : list of Game
+        Games whose board is a position of the suite, with the AI player (at the top) to play.
+    """
+    random.seed(seed)
+    ai = MinimaxAI(1)
+    games = []
+    while len(games) < nb_positions:
+        game = Game(None, CELTIC_GREEN)
+        # An even number of plies, so that the AI player at the top has to play
+        nb_plies = 2 * random.randint(min_plies // 2, max_plies // 2)
+        colors = [game.board.top_opponent_color, game.board.bottom_player_color]
+        for ply in range(nb_plies):
+            all_valid_actions = ai.simulate_all_valid_actions(game.board, colors[ply % 2])
+            game.board = random.choice(all_valid_actions)
+            if game.board.check_winner() != 0:
+                break
+        else:
+            games.append(game)
+    return games
@@ -1,9 +1,13 @@
 import pygame
 import math
-from .constants import GREY, ROWS, COLS, SOFT_YELLOW, SQUARE_SIZE, CELTIC_GREEN, SPQR_RED
+from .constants import GREY, ROWS, COLS, SOFT_YELLOW, SQUARE_SIZE, CELTIC_GREEN, SPQR_RED, COLOR_SIDES, \
+    NO_SIDE, WALL
 from .piece import Piece
 pygame.init()
 
+# Pre-rendered checkerboards, by window size
+BACKGROUNDS = {}
+
 class Board:
     """
     A class to represent the Murus Gallicus game board.
@@ -20,6 +24,10 @@ class Board:
         RGB numbers of the bottom player color, like (255,255,255)
     top_opponent_color : tuple of int
         RGB numbers of the top opponent player color, like (255,255,255).
+    bottom_side : int
+        Side code of the bottom player, like RED_SIDE.
+    top_side : int
+        Side code of the top opponent player, like GREEN_SIDE.
     bottom_tower_left : int
         Number of bottom player's towers remaining on the game.board
     top_tower_left : int
@@ -28,6 +36,8 @@ class Board:
         Number of bottom player's walls remaining on the game.board
     top_wall_left : int
         Number of top player's walls remaining on the game.board
+    last_action : None or tuple of int
+        (from-square, direction, action type) key of the action which led to this board when simulated by the AI.
 
     Methods
     -------
@@ -35,6 +45,10 @@ class Board:
         Deduces the top player color from the bottom one
     draw_squares(window)
         Draws the squares on the GUI to build the game board.
+    get_background(window)
+        Retrieves the pre-rendered checkerboard of the game board, rendering it the first time it is asked.
+    draw_cell(window, row, col)
+        Draws again a single cell of the game board, with its piece if there is one.
     get_piece(row, col)
         Retrieves the piece from a board cell given its row/column coordinates.
     remove_piece(row, col)
@@ -51,6 +65,10 @@ class Board:
         Draws the black and white squares which make the grid of the game board, and the stones/pieces on it.
     def get_valid_actions(piece)
         Computes all the valid actions (move, sacrifice) that can be done on the game board by a given piece.
+    def has_valid_action(color)
+        Checks if the player of the input color can play at least one action.
+    def check_winner()
+        Checks the goal rows and the remaining actions of both players to know if one of them has won.
     """
 
     def __init__(self, bottom_player_color):
@@ -64,9 +82,12 @@ class Board:
         self.selected_piece = None
         self.bottom_player_color = bottom_player_color
         self.top_opponent_color = self.determine_opponent_color(self.bottom_player_color)
+        self.bottom_side = COLOR_SIDES[self.bottom_player_color]
+        self.top_side = COLOR_SIDES[self.top_opponent_color]
         self.create_board(bottom_player_color)
         self.bottom_tower_left = self.top_tower_left = 8
         self.bottom_wall_left = self.top_wall_left = 0
+        self.last_action = None
 
     def determine_opponent_color(self, bottom_player_color):
         """
@@ -103,6 +124,52 @@ class Board:
                 pygame.draw.rect(window, SOFT_YELLOW,
                                  (col*SQUARE_SIZE, row*SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
+    def get_background(self, window):
+        """
+        Retrieves the pre-rendered checkerboard of the game board, rendering it the first time it is asked.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+            The pygame graphical window defined among the constants.
+
+        Returns
+        -------
+        background : pygame.Surface
+            Surface of the size of the window with the squares of the game board drawn on it.
+        """
+        background = BACKGROUNDS.get(window.get_size())
+        if background is None:
+            background = pygame.Surface(window.get_size())
+            self.draw_squares(background)
+            BACKGROUNDS[window.get_size()] = background
+        return background
+
+    def draw_cell(self, window, row, col):
+        """
+        Draws again a single cell of the game board, with its piece if there is one.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+            The pygame graphical window defined among the constants.
+        row : int
+            Row number of the board cell.
+        col : int
+            Column number of the board cell.
+
+        Returns
+        -------
+        cell_rect : pygame.Rect
+            Area of the window where the cell was drawn.
+        """
+        cell_rect = pygame.Rect(col*SQUARE_SIZE, row*SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+        window.blit(self.get_background(window), cell_rect, cell_rect)
+        piece = self.board_grid[row][col]
+        if piece != 0:
+            piece.draw(window)
+        return cell_rect
+
     def get_piece(self, row, col):
         """
         Retrieves the piece from a board cell given its row/column coordinates.
@@ -179,10 +246,8 @@ class Board:
             # Check if there is a piece on the next cell and add one stone (wall)
             next_piece_1 = self.get_piece(next_row_1, next_col_1)
             if next_piece_1 == 0:
-                next_piece_1 = Piece(next_row_1, next_col_1, piece.color)
-                next_piece_1.stack_size = 1
-                self.board_grid[next_row_1][next_col_1] = next_piece_1
-            elif next_piece_1.stack_size == 1 and next_piece_1.color == piece.color:
+                self.board_grid[next_row_1][next_col_1] = Piece(next_row_1, next_col_1, piece.color, WALL)
+            elif next_piece_1.stack_size == 1 and next_piece_1.side == piece.side:
                 next_piece_1.stack_size = 2
             else:
                 print("!! ERROR : No empty cell or piece of stack size 1 on the way !!")
@@ -190,10 +255,8 @@ class Board:
             # Check if there is a piece on the upper next cell and add one stone (wall)
             next_piece_2 = self.get_piece(next_row_2, next_col_2)
             if next_piece_2 == 0:
-                next_piece_2 = Piece(next_row_2, next_col_2, piece.color)
-                next_piece_2.stack_size = 1
-                self.board_grid[next_row_2][next_col_2] = next_piece_2
-            elif next_piece_2.stack_size == 1 and next_piece_2.color == piece.color:
+                self.board_grid[next_row_2][next_col_2] = Piece(next_row_2, next_col_2, piece.color, WALL)
+            elif next_piece_2.stack_size == 1 and next_piece_2.side == piece.side:
                 next_piece_2.stack_size = 2
             else:
                 print("!! ERROR : No empty cell or peice of stack size 1 on the way !!")
@@ -221,11 +284,11 @@ class Board:
         if type(next_piece_1) == Piece:
             self.remove_piece(next_row_1, next_col_1)
             # Update all pieces counts
-            if piece.color == self.bottom_player_color:
+            if piece.side == self.bottom_side:
                 self.bottom_tower_left -= 1
                 self.bottom_wall_left += 1
                 self.top_wall_left -= 1
-            elif piece.color == self.top_opponent_color:
+            elif piece.side == self.top_side:
                 self.top_tower_left -= 1
                 self.top_wall_left += 1
                 self.bottom_wall_left -= 1
@@ -271,7 +334,7 @@ class Board:
             The pygame graphical window defined among the constants.
 
         """
-        self.draw_squares(window)
+        window.blit(self.get_background(window), (0, 0))
         for row in range(ROWS):
             for col in range(COLS):
                 piece = self.board_grid[row][col]
@@ -309,6 +372,7 @@ class Board:
         else:
             row = piece.row
             col = piece.col
+            side = piece.side
             for i in range(-1, 2):
                 for j in range(-1, 2):
 
@@ -332,28 +396,75 @@ class Board:
                         next_piece_1 = self.get_piece(row+i, col+j)
                         next_piece_2 = self.get_piece(row+2*i, col+2*j)
 
-                        # Transform cells without piece into a "null" piece of stack_size == 0
-                        if type(next_piece_1) == int and next_piece_1 == 0:
-                            next_piece_1 = Piece(row+i, col+j, 0)
-                            next_piece_1.stack_size = 0
-                        if type(next_piece_2) == int and next_piece_2 == 0:
-                            next_piece_2 = Piece(row+2*i, col+2*j, 0)
-                            next_piece_2.stack_size = 0
+                        # Cells without piece are read as a "null" piece of stack_size == 0
+                        if next_piece_1 == 0:
+                            next_side_1, next_stack_1 = NO_SIDE, 0
+                        else:
+                            next_side_1, next_stack_1 = next_piece_1.side, next_piece_1.stack_size
+                        if next_piece_2 == 0:
+                            next_side_2, next_stack_2 = NO_SIDE, 0
+                        else:
+                            next_side_2, next_stack_2 = next_piece_2.side, next_piece_2.stack_size
 
                         # Sacrifice on ennemy walls
-                        if next_piece_1.color != piece.color and next_piece_1.stack_size == 1:
+                        if next_side_1 != side and next_stack_1 == 1:
                             sacrifices.append([(row, col), (row + i, col + j)])
 
                         # Move a tower on empty cells or same color walls
-                        elif ((next_piece_1.color == piece.color or next_piece_1.color == 0) and
-                              next_piece_1.stack_size <= 1) \
+                        elif ((next_side_1 == side or next_side_1 == NO_SIDE) and next_stack_1 <= 1) \
                                 and \
-                                ((next_piece_2.color == piece.color or next_piece_2.color == 0) and
-                                 next_piece_2.stack_size <= 1):
+                                ((next_side_2 == side or next_side_2 == NO_SIDE) and next_stack_2 <= 1):
                             moves.append([(row + i, col + j), (row + 2 * i, col + 2 * j)])
 
             return moves, sacrifices
 
+    def has_valid_action(self, color):
+        """
+        Checks if the player of the input color can play at least one action.
+
+        Parameters
+        ----------
+        color : tuple of int
+            RGB numbers of the input player color, like (255,255,255)
+
+        Returns
+        -------
+        has_action : bool
+            True if at least one move or sacrifice can be played by the player, False otherwise.
+        """
+        for piece in self.get_all_same_color_pieces(color):
+            moves, sacrifices = self.get_valid_actions(piece)
+            if moves or sacrifices:
+                return True
+        return False
+
+    def check_winner(self):
+        """
+        Checks the goal rows and the remaining actions of both players to know if one of them has won :
+        a player wins when one of its pieces reaches the opposite side of the board,
+        and loses when it has no action to play.
+
+        Returns
+        -------
+        winner : tuple of int or int
+            RGB color of the player who has won, or 0 if there isn't a winner yet.
+        """
+        # For the player at the bottom of the board
+        for piece in self.get_all_same_color_pieces(self.bottom_player_color):
+            if piece.row == 0:
+                return self.bottom_player_color
+        if not self.has_valid_action(self.bottom_player_color):
+            return self.top_opponent_color
+
+        # For the player at the top of the board
+        for piece in self.get_all_same_color_pieces(self.top_opponent_color):
+            if piece.row == ROWS - 1:
+                return self.top_opponent_color
+        if not self.has_valid_action(self.top_opponent_color):
+            return self.bottom_player_color
+
+        return 0
+
     def evaluate(self):
         """
         Evaluate how good is the game situation for the AI player (at the top of the board).
@@ -413,10 +524,11 @@ class Board:
         same_color_pieces : list of Pieces
             The list of the towers and walls (Pieces) with the input color.
         """
+        side = COLOR_SIDES[color]
         same_color_pieces = []
         for row in self.board_grid:
             for piece in row:
-                if piece != 0 and piece.color == color:
+                if piece != 0 and piece.side == side:
                     same_color_pieces.append(piece)
         return same_color_pieces
 
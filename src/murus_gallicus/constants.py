@@ -27,6 +27,43 @@ DARK_GREEN = (14, 79, 0)
 SPQR_RED = (213, 28, 31)
 DARK_RED = (140, 8, 2)
 
+# SIDES AND STACKS CODES OF THE PIECES
+NO_SIDE, RED_SIDE, GREEN_SIDE = 0, 1, 2
+SIDE_COLORS = {NO_SIDE: 0, RED_SIDE: SPQR_RED, GREEN_SIDE: CELTIC_GREEN}
+COLOR_SIDES = {0: NO_SIDE, SPQR_RED: RED_SIDE, CELTIC_GREEN: GREEN_SIDE}
+WALL, TOWER = 1, 2
+
 P_2_Minimax = "Player VS MiniMax AI"
 P_2_P = "Player vs Player"
 AI_MINIMAX_DEPTH = 3
+
+# AI THINKING TIME TRACING : path of the trace file (None to disable it) and mode ("chrome" or "collapsed")
+AI_TRACE_PATH = None
+AI_TRACE_MODE = "collapsed"
+
+# AI MOVE ORDERING : directions a tower can move to, and action types
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+MOVE, SACRIFICE = 0, 1
+NB_KILLER_MOVES = 2
+
+# AI QUIESCENCE SEARCH : score of a won game, and maximal depth of the sacrifices / goal-row threats extension
+WIN_SCORE = 1000
+QUIESCENCE_DEPTH = 4
+
+# AI PRINCIPAL VARIATION SEARCH : half-width of the first aspiration window, and width of the null windows
+ASPIRATION_WINDOW = 1.0
+NULL_WINDOW = 1e-6
+AI_PVS = False
+
+# Number of the last frames whose duration is kept to monitor the GUI
+FRAME_TIMES_LENGTH = 600
+
+# IDLE MODE : the GUI waits for events (at most IDLE_TIMEOUT milliseconds) instead of redrawing at FPS
+IDLE_MODE = True
+IDLE_TIMEOUT = 1000
+
+# SCENES OF THE GUI
+MENU_SCENE = "MENU"
+COLOR_SCENE = "COLOR"
+GAME_SCENE = "GAME"
+GAME_OVER_SCENE = "GAME_OVER"
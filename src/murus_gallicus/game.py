@@ -1,5 +1,5 @@
 import pygame
-from .constants import SQUARE_SIZE, SPQR_RED, CELTIC_GREEN, CLEAR_BLUE, BLUE
+from .constants import SQUARE_SIZE, SPQR_RED, CELTIC_GREEN, CLEAR_BLUE, BLUE, ROWS, COLS
 from .board import Board
 pygame.init()
 
@@ -23,11 +23,18 @@ class Game:
         The pygame graphical window defined among the constants.
     winner : tuple of int
         RGB color of the player who has won.
+    drawn_cells : None or dict
+        State (side, stack size, action marker) of each cell as last drawn on the window ;
+        None if the whole board has to be drawn again.
 
     Methods
     -------
     update()
-        Deduces the top player color from the bottom one
+        Draws again the cells of the game board which have changed since the last update.
+    invalidate_display()
+        Forces the next update to draw again the whole game board.
+    get_cells_state()
+        Computes the state of each cell as it has to be drawn on the window.
     init(bottom_player_color)
         Initializes the game situation like in the rules of Murus Gallicus.
     reset()
@@ -40,6 +47,8 @@ class Game:
         Changes the game turn : the other player has to play now.
     def draw_valid_actions(all_valid_actions)
         Draws circles where there are possible actions to do with the actual selected piece.
+    draw_action_marker(row, col, marker)
+        Draws the circle showing a possible action of the selected piece on a cell.
     check_if_over()
         Checks all pieces on the board in order to know if one of the 2 player has won or lost,
         and so if the game is over.
@@ -65,14 +74,62 @@ class Game:
         self.window = window
         self.is_over = False
         self.winner = 0
+        self.drawn_cells = None
 
     def update(self):
         """
-        Updates the game situation.
+        Updates the game situation : only the cells which have changed since the last update
+        (after a move or a selection change) are drawn again and updated on the display.
+
+        Returns
+        -------
+        dirty_rects : list of pygame.Rect
+            Areas of the window which have been updated.
+        """
+        cells_state = self.get_cells_state()
+        if self.drawn_cells is None:
+            self.board.draw(self.window)
+            self.draw_valid_actions(self.valid_actions)
+            dirty_rects = [self.window.get_rect()]
+        else:
+            dirty_rects = []
+            for cell, cell_state in cells_state.items():
+                if self.drawn_cells[cell] != cell_state:
+                    row, col = cell
+                    dirty_rects.append(self.board.draw_cell(self.window, row, col))
+                    self.draw_action_marker(row, col, cell_state[2])
+        self.drawn_cells = cells_state
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+        return dirty_rects
+
+    def invalidate_display(self):
         """
-        self.board.draw(self.window)
-        self.draw_valid_actions(self.valid_actions)
-        pygame.display.update()
+        Forces the next update to draw again the whole game board, for instance after another screen was displayed.
+        """
+        self.drawn_cells = None
+
+    def get_cells_state(self):
+        """
+        Computes the state of each cell as it has to be drawn on the window.
+
+        Returns
+        -------
+        cells_state : dict
+            For each (row, col) cell : side and stack size of its piece (0 if empty),
+            and the marker of the valid action of the selected piece on it (0 : none, 1 : move, 2 : sacrifice).
+        """
+        cells_state = {}
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.board.board_grid[row][col]
+                cells_state[(row, col)] = (0, 0, 0) if piece == 0 else (piece.side, piece.stack_size, 0)
+        if len(self.valid_actions) > 0:
+            for marker, actions in ((1, self.valid_actions[0]), (2, self.valid_actions[1])):
+                for action in actions:
+                    cell = action[1]
+                    cells_state[cell] = cells_state[cell][:2] + (marker,)
+        return cells_state
 
     def init(self, bottom_player_color):
         """
@@ -89,6 +146,7 @@ class Game:
         self.valid_actions = {}
         self.is_over = False
         self.winner = 0
+        self.drawn_cells = None
 
     def reset(self, bottom_player_color):
         """
@@ -179,12 +237,27 @@ class Game:
         if len(all_valid_actions) > 0:
             for move in all_valid_actions[0]:
                 row, col = move[1]
-                x, y = SQUARE_SIZE * col + SQUARE_SIZE // 2, SQUARE_SIZE * row + SQUARE_SIZE // 2
-                pygame.draw.circle(self.window, BLUE, (x, y), 15)
+                self.draw_action_marker(row, col, 1)
             for sacrifice in all_valid_actions[1]:
                 row, col = sacrifice[1]
-                x, y = SQUARE_SIZE * col + SQUARE_SIZE // 2, SQUARE_SIZE * row + SQUARE_SIZE // 2
-                pygame.draw.circle(self.window, CLEAR_BLUE, (x, y), 15)
+                self.draw_action_marker(row, col, 2)
+
+    def draw_action_marker(self, row, col, marker):
+        """
+        Draws the circle showing a possible action of the selected piece on a cell.
+
+        Parameters
+        ----------
+        row : int
+            Row number of the board cell.
+        col : int
+            Column number of the board cell.
+        marker : int
+            Type of the possible action : 0 for none, 1 for a move, 2 for a sacrifice.
+        """
+        if marker != 0:
+            x, y = SQUARE_SIZE * col + SQUARE_SIZE // 2, SQUARE_SIZE * row + SQUARE_SIZE // 2
+            pygame.draw.circle(self.window, BLUE if marker == 1 else CLEAR_BLUE, (x, y), 15)
 
     def check_if_over(self):
         """
@@ -196,48 +269,15 @@ class Game:
         is_game_over : bool
             True if there's a game over situation, False otherwise.
         """
-        # Retrieve all walls and tower of both players
-        all_bottom_pieces = self.board.get_all_same_color_pieces(self.board.bottom_player_color)
-        all_top_pieces = self.board.get_all_same_color_pieces(self.board.top_opponent_color)
-
-        # Check if one of the 2 players has won
-
-        # For the player at the bottom of the board
-        nb_possible_actions = 0
-        for piece in all_bottom_pieces:
-            moves, sacrifices = self.board.get_valid_actions(piece)
-            nb_possible_actions += len(moves) + len(sacrifices)
-            # The player has won if one of its pieces has reached the end of the board
-            if piece.row == 0:
-                self.is_over = True
-                self.winner = self.board.bottom_player_color
-                return True
-        # The player has lost if he has no action no play
-        if nb_possible_actions == 0:
+        winner = self.board.check_winner()
+        if winner != 0:
             self.is_over = True
-            self.winner = self.board.top_opponent_color
-            return True
-
-        # For the player at the top of the board
-        nb_possible_actions = 0
-        for piece in all_top_pieces:
-            moves, sacrifices = self.board.get_valid_actions(piece)
-            nb_possible_actions += len(moves) + len(sacrifices)
-            # The player has won if one of its pieces has reached the end of the board
-            if piece.row == 6:
-                self.is_over = True
-                self.winner = self.board.top_opponent_color
-                return True
-        # The player has lost if he has no action no play
-        if nb_possible_actions == 0:
-            self.is_over = True
-            self.winner = self.board.bottom_player_color
+            self.winner = winner
             return True
 
         # Otherwise it means there isn't a winner yet
         return False
 
-
     def get_board(self):
         """
         Retrieve the attribute "board" of the class Game.
@@ -1,6 +1,8 @@
 from copy import deepcopy
 import random
 import pygame
+from .constants import ROWS, COLS, DIRECTIONS, MOVE, SACRIFICE, NB_KILLER_MOVES, WIN_SCORE, QUIESCENCE_DEPTH, \
+    ASPIRATION_WINDOW, NULL_WINDOW
 
 class MinimaxAI:
     """
@@ -12,31 +14,136 @@ class MinimaxAI:
     ----------
     initial_depth : int
         Depth of the MiniMax trees generated each time the AI computes the best action to play.
+    quiescence_depth : int
+        Maximal depth of the quiescence search which extends the sacrifices and goal-row threats
+        at the horizon of the MiniMax trees (0 to disable it).
+    pvs : bool
+        True to search the children after the first one with a null window (Principal Variation Search),
+        and to re-search them with the full window only when they fail high.
+    killer_moves : dict
+        For each ply of the search, the last actions which caused a cutoff at this ply.
+    history : dict
+        History heuristic score of each action (from-square, direction, action type), increased on cutoffs.
+    stats : dict
+        Statistics of the last search : visited nodes, cutoffs, cutoffs made by the first searched child and re-searches.
+    principal_variation : list of tuple of int
+        Keys of the actions of the principal variation found by the last search, from the root.
 
     Methods
     -------
-    play_minimax(board, depth, max_player, game)
-        Executes the MiniMax algorithm to compute the best action to play for the AI.
+    search(board, game, max_depth, max_player)
+        Executes the MiniMax algorithm by iterative deepening with aspiration windows,
+        and returns the principal variation with the best action to play.
+    play_minimax(board, depth, max_player, game, alpha, beta)
+        Executes the MiniMax algorithm with alpha-beta pruning to compute the best action to play for the AI.
+    search_child(child, depth, max_player, game, alpha, beta, index)
+        Searches a child node, first with a null window if the Principal Variation Search is enabled.
+    quiescence(board, depth, max_player, game, alpha, beta, ply)
+        Extends the search at the horizon with sacrifices and goal-row threats only, until the position is quiet.
+    get_terminal_score(winner, game, ply)
+        Computes the evaluation of a won game, preferring the fastest wins and the slowest losses.
+    is_tactical_action(board, piece, action)
+        Checks if an action is a sacrifice or a goal-row threat, to be extended by the quiescence search.
+    reset_stats()
+        Resets the statistics of the search and the killer moves, and ages the history heuristic.
+    first_move_cutoff_rate()
+        Computes the ratio of the cutoffs made by the first searched child, which measures the move ordering quality.
+    get_action_key(piece, action)
+        Computes the (from-square, direction, action type) key of an action.
+    get_action_priority(action_key, ply)
+        Computes the priority of an action for the move ordering, from the principal variation,
+        the killer moves and the history heuristic.
+    record_cutoff(action_key, ply, depth, index)
+        Updates the killer moves, the history heuristic and the statistics after a cutoff.
     simulate_action(piece, action, temp_board)
         Simulates an action of an input piece and returns the associated board.
-    simulate_all_valid_actions(board, color, game)
+    simulate_all_valid_actions(board, color, ply, tactical_only)
         Retrieves in a list of simulated boards all the possible actions that can be played
-        by a given player on a given board.
+        by a given player on a given board, ordered from the most promising one.
     draw_moves(game, board, piece)
         Draws on the board the actions checked by the AI during the execution of the MiniMax algorithm.
     """
-    def __init__(self, depth):
+    def __init__(self, depth, quiescence_depth=QUIESCENCE_DEPTH, pvs=False):
         """
         Parameters
         ----------
         depth : int
             Tree depth of the Minimax Algorithm.
+        quiescence_depth : int
+            Maximal depth of the quiescence search at the horizon (0 to disable it).
+        pvs : bool
+            True to enable the Principal Variation Search.
         """
         self.initial_depth = depth
+        self.quiescence_depth = quiescence_depth
+        self.pvs = pvs
+        self.history = {}
+        self.principal_variation = []
+        self.pv_table = {}
+        self.iterative_deepening = False
+        self.reset_stats()
 
-    def play_minimax(self, board, depth, max_player, game):
+    def search(self, board, game, max_depth=None, max_player=True):
         """
-        Executes the MiniMax algorithm to compute the best action to play for the AI.
+        Executes the MiniMax algorithm by iterative deepening : each iteration is searched one ply deeper
+        within an aspiration window around the score of the previous one, widened when the score falls outside.
+
+        Parameters
+        ----------
+        board : Board
+            Game board.
+        game : Game
+            Murus Gallicus Game.
+        max_depth : None or int
+            Tree depth of the last iteration ; if None, the initial depth of the AI.
+        max_player : bool
+            True if the AI player (at the top of the board) has to play, False if it's the other.
+
+        Returns
+        -------
+        max_min_eval : float
+            Heuristic quality evaluation score of the last iteration.
+        best_action : Board
+            Simulated game board containing the best action to play.
+        principal_variation : list of tuple of int
+            Keys of the actions of the principal variation, from the root.
+        """
+        max_depth = max_depth or self.initial_depth
+        self.reset_stats()
+        self.principal_variation = []
+        self.iterative_deepening = True
+        evaluation, best_action = None, None
+        try:
+            for depth in range(1, max_depth + 1):
+                self.initial_depth = depth
+                window = ASPIRATION_WINDOW
+                if evaluation is None or abs(evaluation) >= WIN_SCORE - max_depth:
+                    alpha, beta = float('-inf'), float('inf')
+                else:
+                    alpha, beta = evaluation - window, evaluation + window
+                while True:
+                    self.pv_table = {}
+                    iteration_eval, iteration_action = self.play_minimax(board, depth, max_player, game, alpha, beta)
+                    # Widen the window on the failing side, up to the full window
+                    if iteration_eval <= alpha and alpha != float('-inf'):
+                        window *= 4
+                        alpha = iteration_eval - window if window < WIN_SCORE else float('-inf')
+                    elif iteration_eval >= beta and beta != float('inf'):
+                        window *= 4
+                        beta = iteration_eval + window if window < WIN_SCORE else float('inf')
+                    else:
+                        break
+                    self.stats["aspiration_researches"] += 1
+                evaluation, best_action = iteration_eval, iteration_action
+                self.principal_variation = list(self.pv_table.get(0, []))
+        finally:
+            self.initial_depth = max_depth
+            self.iterative_deepening = False
+        return evaluation, best_action, self.principal_variation
+
+    def play_minimax(self, board, depth, max_player, game, alpha=float('-inf'), beta=float('inf')):
+        """
+        Executes the MiniMax algorithm with alpha-beta pruning to compute the best action to play for the AI.
 
         Parameters
         ----------
@@ -48,6 +155,10 @@ class MinimaxAI:
             True if the AI player is simulated, False if it's the other.
         game : Game
             Murus Gallicus Game.
+        alpha : float
+            Best evaluation the maximizing player is already assured of.
+        beta : float
+            Best evaluation the minimizing player is already assured of.
 
         Returns
         -------
@@ -56,33 +167,314 @@ class MinimaxAI:
         best_action : Board
             Simulated game board containing the best action to play.
         """
-        if depth == 0 or (game.check_if_over() and game.winner != 0):
-            return board.evaluate(), board
+        if depth == self.initial_depth and not self.iterative_deepening:
+            self.reset_stats()
+            self.principal_variation = []
+            self.pv_table = {}
+        self.stats["nodes"] += 1
+        ply = self.initial_depth - depth
+        self.pv_table[ply] = []
+
+        winner = board.check_winner()
+        if winner != 0:
+            return self.get_terminal_score(winner, game, ply), board
+
+        elif depth == 0:
+            return self.quiescence(board, self.quiescence_depth, max_player, game, alpha, beta, ply), board
 
         elif max_player:
             max_eval = float('-inf')
             best_action = None
-            all_valid_actions = self.simulate_all_valid_actions(board, game.board.top_opponent_color)
-            random.shuffle(all_valid_actions) # Remove the shuffling if the minimax deapth increases
-            for action in all_valid_actions:
-                evaluation = self.play_minimax(action, depth-1, False, game)[0]
-                max_eval = max(max_eval, evaluation)
-                if max_eval == evaluation:
+            all_valid_actions = self.simulate_all_valid_actions(board, game.board.top_opponent_color, ply)
+            for index, action in enumerate(all_valid_actions):
+                evaluation = self.search_child(action, depth-1, False, game, alpha, beta, index)
+                if best_action is None or evaluation > max_eval:
+                    max_eval = evaluation
                     best_action = action
+                if evaluation > alpha:
+                    self.pv_table[ply] = [action.last_action] + self.pv_table.get(ply+1, [])
+                alpha = max(alpha, evaluation)
+                if alpha >= beta:
+                    self.record_cutoff(action.last_action, ply, depth, index)
+                    break
             return max_eval, best_action
 
         else:
             min_eval = float('inf')
             best_action = None
-            all_valid_actions = self.simulate_all_valid_actions(board, game.board.bottom_player_color)
-            random.shuffle(all_valid_actions) # Remove the shuffling if the minimax deapth increases
-            for action in all_valid_actions:
-                evaluation = self.play_minimax(action, depth-1, True, game)[0]
-                min_eval = min(min_eval, evaluation)
-                if min_eval == evaluation:
+            all_valid_actions = self.simulate_all_valid_actions(board, game.board.bottom_player_color, ply)
+            for index, action in enumerate(all_valid_actions):
+                evaluation = self.search_child(action, depth-1, True, game, alpha, beta, index)
+                if best_action is None or evaluation < min_eval:
+                    min_eval = evaluation
                     best_action = action
+                if evaluation < beta:
+                    self.pv_table[ply] = [action.last_action] + self.pv_table.get(ply+1, [])
+                beta = min(beta, evaluation)
+                if alpha >= beta:
+                    self.record_cutoff(action.last_action, ply, depth, index)
+                    break
             return min_eval, best_action
 
+    def search_child(self, child, depth, max_player, game, alpha, beta, index):
+        """
+        Searches a child node. If the Principal Variation Search is enabled, the children after the first one
+        are expected to be worse : they are first searched with a null window to prove it cheaply,
+        and re-searched with the full window only if they turn out to be better.
+
+        Parameters
+        ----------
+        child : Board
+            Simulated game board of the child node.
+        depth : int
+            Tree depth of the MiniMax Algorithm for the child node.
+        max_player : bool
+            True if the AI player has to play in the child node, False if it's the other.
+        game : Game
+            Murus Gallicus Game.
+        alpha : float
+            Best evaluation the maximizing player is already assured of.
+        beta : float
+            Best evaluation the minimizing player is already assured of.
+        index : int
+            Index of the child among the searched children, 0 if it is the first one.
+
+        Returns
+        -------
+        max_min_eval : float
+            Heuristic quality evaluation score of the child node.
+        """
+        if self.pvs and index > 0:
+            if max_player:
+                null_alpha, null_beta = beta - NULL_WINDOW, beta
+            else:
+                null_alpha, null_beta = alpha, alpha + NULL_WINDOW
+            evaluation = self.play_minimax(child, depth, max_player, game, null_alpha, null_beta)[0]
+            if not alpha < evaluation < beta:
+                return evaluation
+            self.stats["researches"] += 1
+        return self.play_minimax(child, depth, max_player, game, alpha, beta)[0]
+
+    def quiescence(self, board, depth, max_player, game, alpha, beta, ply):
+        """
+        Extends the search at the horizon with sacrifices and goal-row threats only, until the position is quiet,
+        so that the evaluation isn't done in the middle of an exchange.
+
+        Parameters
+        ----------
+        board : Board
+            Game board.
+        depth : int
+            Remaining depth of the quiescence search.
+        max_player : bool
+            True if the AI player is simulated, False if it's the other.
+        game : Game
+            Murus Gallicus Game.
+        alpha : float
+            Best evaluation the maximizing player is already assured of.
+        beta : float
+            Best evaluation the minimizing player is already assured of.
+        ply : int
+            Number of actions played since the root of the search.
+
+        Returns
+        -------
+        max_min_eval : float
+            Heuristic quality evaluation score of the quiet position.
+        """
+        self.stats["quiescence_nodes"] += 1
+        winner = board.check_winner()
+        if winner != 0:
+            return self.get_terminal_score(winner, game, ply)
+
+        # The player to play can always "stand pat" : refuse the exchanges and keep the static evaluation
+        stand_pat = board.evaluate()
+        if depth == 0:
+            return stand_pat
+
+        if max_player:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            max_eval = stand_pat
+            for index, action in enumerate(self.simulate_all_valid_actions(
+                    board, game.board.top_opponent_color, ply, tactical_only=True)):
+                evaluation = self.quiescence(action, depth-1, False, game, alpha, beta, ply+1)
+                max_eval = max(max_eval, evaluation)
+                alpha = max(alpha, evaluation)
+                if alpha >= beta:
+                    self.record_cutoff(action.last_action, ply, 1, index)
+                    break
+            return max_eval
+
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+            min_eval = stand_pat
+            for index, action in enumerate(self.simulate_all_valid_actions(
+                    board, game.board.bottom_player_color, ply, tactical_only=True)):
+                evaluation = self.quiescence(action, depth-1, True, game, alpha, beta, ply+1)
+                min_eval = min(min_eval, evaluation)
+                beta = min(beta, evaluation)
+                if alpha >= beta:
+                    self.record_cutoff(action.last_action, ply, 1, index)
+                    break
+            return min_eval
+
+    @staticmethod
+    def get_terminal_score(winner, game, ply):
+        """
+        Computes the evaluation of a won game, preferring the fastest wins and the slowest losses.
+
+        Parameters
+        ----------
+        winner : tuple of int
+            RGB color of the player who has won.
+        game : Game
+            Murus Gallicus Game.
+        ply : int
+            Number of actions played since the root of the search.
+
+        Returns
+        -------
+        terminal_score : float
+            Evaluation of the won game for the AI player (at the top of the board).
+        """
+        if winner == game.board.top_opponent_color:
+            return WIN_SCORE - ply
+        return -WIN_SCORE + ply
+
+    @staticmethod
+    def is_tactical_action(board, piece, action):
+        """
+        Checks if an action is a sacrifice or a goal-row threat, to be extended by the quiescence search.
+        A goal-row threat is a move which reaches the opposite side of the board,
+        or which builds a tower close enough to reach it on the next move.
+
+        Parameters
+        ----------
+        board : Board
+            Game board before the action.
+        piece : Piece
+            Game piece : tower which plays the action.
+        action : list of tuples
+            List of tuple of row/col coordinates representing the action to play.
+
+        Returns
+        -------
+        is_tactical : bool
+            True if the action is a sacrifice or a goal-row threat, False otherwise.
+        """
+        if action[0] == (piece.row, piece.col):
+            return True
+        goal_row = 0 if piece.side == board.bottom_side else ROWS - 1
+        for row, col in action:
+            distance_to_goal = abs(goal_row - row)
+            if distance_to_goal == 0:
+                return True
+            # Landing on a wall of the same color builds a new tower
+            if distance_to_goal <= 2 and board.get_piece(row, col) != 0:
+                return True
+        return False
+
+    def reset_stats(self):
+        """
+        Resets the statistics of the search and the killer moves, and ages the history heuristic.
+        """
+        self.stats = {"nodes": 0, "quiescence_nodes": 0, "cutoffs": 0, "first_move_cutoffs": 0,
+                      "researches": 0, "aspiration_researches": 0}
+        self.killer_moves = {}
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def first_move_cutoff_rate(self):
+        """
+        Computes the ratio of the cutoffs made by the first searched child, which measures the move ordering quality.
+
+        Returns
+        -------
+        rate : float
+            Ratio between 0 and 1 of the cutoffs made by the first searched child (0 if there was no cutoff).
+        """
+        if self.stats["cutoffs"] == 0:
+            return 0.
+        return self.stats["first_move_cutoffs"] / self.stats["cutoffs"]
+
+    @staticmethod
+    def get_action_key(piece, action):
+        """
+        Computes the (from-square, direction, action type) key of an action.
+
+        Parameters
+        ----------
+        piece : Piece
+            Game piece : tower which plays the action.
+        action : list of tuples
+            List of tuple of row/col coordinates representing the action to play.
+
+        Returns
+        -------
+        action_key : tuple of int
+            Square number of the piece, index of the direction among DIRECTIONS, and MOVE or SACRIFICE.
+        """
+        if action[0] == (piece.row, piece.col):
+            next_row, next_col = action[1]
+            kind = SACRIFICE
+        else:
+            next_row, next_col = action[0]
+            kind = MOVE
+        direction = DIRECTIONS.index((next_row - piece.row, next_col - piece.col))
+        return piece.row * COLS + piece.col, direction, kind
+
+    def get_action_priority(self, action_key, ply):
+        """
+        Computes the priority of an action for the move ordering, from the principal variation,
+        the killer moves and the history heuristic.
+
+        Parameters
+        ----------
+        action_key : tuple of int
+            (from-square, direction, action type) key of the action.
+        ply : int
+            Number of actions played since the root of the search.
+
+        Returns
+        -------
+        priority : tuple of int
+            The higher the priority, the sooner the action is searched : action of the previous principal variation
+            first, then killer moves, then by history score.
+        """
+        if ply < len(self.principal_variation) and self.principal_variation[ply] == action_key:
+            return NB_KILLER_MOVES + 1, 0
+        killers = self.killer_moves.get(ply, [])
+        if action_key in killers:
+            return NB_KILLER_MOVES - killers.index(action_key), 0
+        return 0, self.history.get(action_key, 0)
+
+    def record_cutoff(self, action_key, ply, depth, index):
+        """
+        Updates the killer moves, the history heuristic and the statistics after a cutoff.
+
+        Parameters
+        ----------
+        action_key : tuple of int
+            (from-square, direction, action type) key of the action which caused the cutoff.
+        ply : int
+            Number of actions played since the root of the search.
+        depth : int
+            Remaining depth of the search at the node where the cutoff happened.
+        index : int
+            Index of the action among the searched children, 0 if it was the first one.
+        """
+        self.stats["cutoffs"] += 1
+        if index == 0:
+            self.stats["first_move_cutoffs"] += 1
+        killers = self.killer_moves.setdefault(ply, [])
+        if action_key not in killers:
+            killers.insert(0, action_key)
+            del killers[NB_KILLER_MOVES:]
+        self.history[action_key] = self.history.get(action_key, 0) + depth * depth
+
     @staticmethod
     def simulate_action(piece, action, temp_board):
         """
@@ -113,34 +505,51 @@ class MinimaxAI:
             temp_board.move_tower(piece, next_row_1, next_col_1, next_row_2, next_col_2)
         return temp_board
 
-    def simulate_all_valid_actions(self, board, color):
+    def simulate_all_valid_actions(self, board, color, ply=None, tactical_only=False):
         """
         Retrieves in a list of simulated boards all the possible actions that can be played
-        by a given player on a given board.
+        by a given player on a given board, ordered from the most promising one.
 
         Parameters
         ----------
         board
         color : tuple of int
             RGB numbers of the input player color, like (255,255,255)
+        ply : None or int
+            Number of actions played since the root of the search, used to order the actions
+            with the killer moves and the history heuristic ; if None, the actions are only shuffled.
+        tactical_only : bool
+            True to keep only the sacrifices and the goal-row threats, for the quiescence search.
 
         Returns
         -------
         all_simulated_boards : List of Boards
              List of temporary game boards with each time a different played action among all the possible valid ones.
+             The attribute "last_action" of each board is the key of its played action.
         """
-        all_simulated_boards = []
-
+        all_valid_actions = []
         for piece in board.get_all_same_color_pieces(color):
             moves, sacrifices = board.get_valid_actions(piece)
             valid_actions = moves
             valid_actions.extend(sacrifices)
             for action in valid_actions:
-                #draw_moves(game, board, piece)
-                temp_board = deepcopy(board)
-                temp_piece = temp_board.get_piece(piece.row, piece.col)
-                new_board = self.simulate_action(temp_piece, action, temp_board)
-                all_simulated_boards.append(new_board)
+                if not tactical_only or self.is_tactical_action(board, piece, action):
+                    all_valid_actions.append((self.get_action_key(piece, action), piece, action))
+
+        # Shuffle first so that actions of equal priority are still played in a random order
+        random.shuffle(all_valid_actions)
+        if ply is not None:
+            all_valid_actions.sort(key=lambda valid_action: self.get_action_priority(valid_action[0], ply),
+                                   reverse=True)
+
+        all_simulated_boards = []
+        for action_key, piece, action in all_valid_actions:
+            #draw_moves(game, board, piece)
+            temp_board = deepcopy(board)
+            temp_piece = temp_board.get_piece(piece.row, piece.col)
+            new_board = self.simulate_action(temp_piece, action, temp_board)
+            new_board.last_action = action_key
+            all_simulated_boards.append(new_board)
 
         return all_simulated_boards
 
@@ -1,32 +1,42 @@
 import pygame
-from .constants import SQUARE_SIZE, PADDING, OUTLINE, SPQR_RED, BLACK
+from .constants import SQUARE_SIZE, PADDING, OUTLINE, BLACK, SIDE_COLORS, COLOR_SIDES, TOWER, WALL
 pygame.init()
 
+# Pre-rendered sprites of the pieces, by (side, stack_size)
+SPRITES = {}
+
 class Piece:
     """
-    A class to represent a Murus Gallicus Game between 2 players.
+    A class to represent a stone of the Murus Gallicus game board : a tower or a wall.
 
     ...
 
+    The pieces are used by every rules function and copied for every simulated board of the AI,
+    so they only store small ints in slots : no RGB color nor pixel position is stored.
+
     Attributes
     ----------
     row : int
         Piece row on the board grid.
     col : int
         Piece column on the board grid.
+    side : int
+        Code of the owner of the piece : RED_SIDE or GREEN_SIDE (NO_SIDE for no owner).
+    stack_size : int
+        Number of stones of the piece : TOWER (2) or WALL (1).
     color : tuple of int
-        RGB color of the owner of the piece.
-    direction : array
-        Side of the board aimed by the piece; whether 1 or -1.
+        RGB color of the owner of the piece, deduced from its side.
     x : int
-        X / width coordinate of the center of the piece on the game board.
-    y : tuple of int
-        Y / height coordinate of the center of the piece on the game board.
+        X / width coordinate of the center of the piece on the game board, computed when drawn.
+    y : int
+        Y / height coordinate of the center of the piece on the game board, computed when drawn.
 
     Methods
     -------
     calculate_window_position()
-        Calculates absolute graphical positive from row and column of the cell where the piece is.
+        Calculates absolute graphical position from row and column of the cell where the piece is.
+    get_sprite(side, stack_size)
+        Retrieves the pre-rendered sprite of a piece, rendering it the first time it is asked.
     become_wall()
         Transform a tower / an input piece (double stone) into a wall (simple stone).
     become_tower()
@@ -36,8 +46,9 @@ class Piece:
     move(row, col)
         Replaces the piece's row and column with the input ones.
     """
+    __slots__ = ("row", "col", "side", "stack_size")
 
-    def __init__(self, row, col, color):
+    def __init__(self, row, col, color, stack_size=TOWER):
         """
         Parameters
         ----------
@@ -47,33 +58,93 @@ class Piece:
             Column number of the board cell.
         color
             RGB color of the piece, like (255, 255, 255).
+        stack_size : int
+            Number of stones of the piece : TOWER (2) or WALL (1).
         """
         self.row = row
         self.col = col
-        self.color = color
-        self.stack_size = 2
-        self.x = 0
-        self.y = 0
-        self.calculate_window_position()
+        self.side = COLOR_SIDES[color]
+        self.stack_size = stack_size
+
+    def __deepcopy__(self, memo):
+        # Copy the slots directly : much faster than the generic copy protocol for every simulated board
+        piece = Piece.__new__(Piece)
+        piece.row, piece.col, piece.side, piece.stack_size = self.row, self.col, self.side, self.stack_size
+        memo[id(self)] = piece
+        return piece
+
+    @property
+    def color(self):
+        return SIDE_COLORS[self.side]
+
+    @property
+    def x(self):
+        return SQUARE_SIZE * self.col + SQUARE_SIZE // 2
+
+    @property
+    def y(self):
+        return SQUARE_SIZE * self.row + SQUARE_SIZE // 2
 
     def calculate_window_position(self):
         """
-        Calculates absolute graphical positive from row and column of the cell where the piece is.
+        Calculates absolute graphical position from row and column of the cell where the piece is.
+
+        Returns
+        -------
+        x : int
+            X / width coordinate of the center of the piece on the game board.
+        y : int
+            Y / height coordinate of the center of the piece on the game board.
+        """
+        return self.x, self.y
+
+    @staticmethod
+    def get_sprite(side, stack_size):
+        """
+        Retrieves the pre-rendered sprite of a piece, rendering it the first time it is asked.
+
+        Parameters
+        ----------
+        side : int
+            Code of the owner of the piece : RED_SIDE or GREEN_SIDE.
+        stack_size : int
+            Number of stones of the piece : TOWER (2) or WALL (1).
+
+        Returns
+        -------
+        sprite : pygame.Surface
+            Transparent square surface of the size of a board cell, with the piece drawn at its center.
         """
-        self.x = SQUARE_SIZE * self.col + SQUARE_SIZE // 2
-        self.y = SQUARE_SIZE * self.row + SQUARE_SIZE // 2
+        sprite = SPRITES.get((side, stack_size))
+        if sprite is None:
+            sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+            radius = SQUARE_SIZE // 2 - PADDING
+            x = y = SQUARE_SIZE // 2
+            color = SIDE_COLORS[side]
+            if stack_size == TOWER:
+                x1, y1 = x - SQUARE_SIZE//8, y - SQUARE_SIZE//8
+                x2, y2 = x + SQUARE_SIZE//8, y + SQUARE_SIZE//8
+                pygame.draw.circle(sprite, BLACK, (x1, y1), radius + OUTLINE)
+                pygame.draw.circle(sprite, color, (x1, y1), radius)
+                pygame.draw.circle(sprite, BLACK, (x2, y2), radius + OUTLINE)
+                pygame.draw.circle(sprite, color, (x2, y2), radius)
+            else:
+                pygame.draw.circle(sprite, BLACK, (x, y), radius + OUTLINE)
+                pygame.draw.circle(sprite, color, (x, y), radius)
+            SPRITES[(side, stack_size)] = sprite
+        return sprite
 
     def become_wall(self):
         """
         Transform a tower / an input piece (double stone) into a wall (simple stone).
         """
-        self.stack_size = 1
+        self.stack_size = WALL
 
     def become_tower(self):
         """
         Transform a wall / an input piece (simple stone) into a tower (double stone).
         """
-        self.stack_size = 2
+        self.stack_size = TOWER
 
     def draw(self, window):
         """
@@ -84,17 +155,7 @@ class Piece:
             window : pygame.Surface
                 The pygame graphical window defined among the constants.
         """
-        radius = SQUARE_SIZE // 2 - PADDING
-        if self.stack_size == 2:
-            x1, y1 = self.x - SQUARE_SIZE//8, self.y - SQUARE_SIZE//8
-            x2, y2 = self.x + SQUARE_SIZE//8, self.y + SQUARE_SIZE//8
-            pygame.draw.circle(window, BLACK, (x1, y1), radius + OUTLINE)
-            pygame.draw.circle(window, self.color, (x1, y1), radius)
-            pygame.draw.circle(window, BLACK, (x2, y2), radius + OUTLINE)
-            pygame.draw.circle(window, self.color, (x2, y2), radius)
-        else:
-            pygame.draw.circle(window, BLACK, (self.x, self.y), radius + OUTLINE)
-            pygame.draw.circle(window, self.color, (self.x, self.y), radius)
+        window.blit(self.get_sprite(self.side, self.stack_size), (SQUARE_SIZE * self.col, SQUARE_SIZE * self.row))
 
     def move(self, row, col):
         """
@@ -109,4 +170,3 @@ class Piece:
         """
         self.row = row
         self.col = col
-        self.calculate_window_position()
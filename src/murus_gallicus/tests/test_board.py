@@ -131,5 +131,18 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(board.top_tower_left, 8)
         self.assertEqual(board.top_wall_left, 8)
 
+    def test_check_winner(self):
+        """Test if the winner is found when a piece reaches the opposite side, or when a player can't play."""
+        board = Board(CELTIC_GREEN)
+        self.assertEqual(board.check_winner(), 0)
+        self.assertTrue(board.has_valid_action(CELTIC_GREEN))
+        board.board_grid[0][3] = Piece(0, 3, CELTIC_GREEN)
+        self.assertEqual(board.check_winner(), CELTIC_GREEN)
+        board = Board(CELTIC_GREEN)
+        for piece in board.get_all_same_color_pieces(SPQR_RED):
+            piece.become_wall()
+        self.assertFalse(board.has_valid_action(SPQR_RED))
+        self.assertEqual(board.check_winner(), CELTIC_GREEN)
+
 if __name__ == '__main__':
     unittest.main()
@@ -83,6 +83,22 @@ class TestGame(unittest.TestCase):
         self.assertEqual(game.winner, CELTIC_GREEN)
         self.assertIsInstance(game.winner, tuple)
 
+    def test_update_only_draws_changed_cells(self):
+        """Test if the display update draws the whole board first, then only the cells which have changed."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        self.assertEqual(game.update(), [WINDOW.get_rect()])
+        self.assertEqual(game.update(), [])
+        # Selecting a tower shows its 3 possible moves
+        game.turn = CELTIC_GREEN
+        game.select(6, 3)
+        self.assertEqual(len(game.update()), 3)
+        # Moving it changes its cell and the 2 next ones, and removes the 3 markers
+        game.select(4, 3)
+        self.assertEqual(len(game.update()), 5)
+        self.assertEqual(game.update(), [])
+        game.invalidate_display()
+        self.assertEqual(game.update(), [WINDOW.get_rect()])
+
     def test_ai_move(self):
         """Test if the input board returned by the AI algorithm is well taken into account."""
         game = Game(WINDOW, CELTIC_GREEN)
@@ -0,0 +1,106 @@
+import unittest
+from src.murus_gallicus.minimax import MinimaxAI
+from src.murus_gallicus.game import Game
+from src.murus_gallicus.board import Board
+from src.murus_gallicus.piece import Piece
+from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN, WINDOW, MOVE, SACRIFICE, WIN_SCORE
+
+def create_empty_board(bottom_player_color, pieces):
+    """Creates a game board with only the input pieces, given as (row, col, color, stack_size)."""
+    board = Board(bottom_player_color)
+    board.board_grid = [[0 for col in range(8)] for row in range(7)]
+    for row, col, color, stack_size in pieces:
+        board.board_grid[row][col] = Piece(row, col, color)
+        board.board_grid[row][col].stack_size = stack_size
+    board.update_towers_walls_left()
+    return board
+
+def plain_minimax(ai, board, depth, max_player, game):
+    """Computes the MiniMax evaluation without any pruning, to be compared with the AI one."""
+    if depth == 0:
+        return board.evaluate()
+    color = game.board.top_opponent_color if max_player else game.board.bottom_player_color
+    evaluations = [plain_minimax(ai, child, depth - 1, not max_player, game)
+                   for child in ai.simulate_all_valid_actions(board, color)]
+    return max(evaluations) if max_player else min(evaluations)
+
+class TestMinimax(unittest.TestCase):
+    """Class of Unit Tests to check bugs in the MinimaxAI Class."""
+
+    def test_action_key(self):
+        """Test if the (from-square, direction, action type) key of the actions is well computed."""
+        piece = Piece(6, 4, CELTIC_GREEN)
+        self.assertEqual(MinimaxAI.get_action_key(piece, [(5, 3), (4, 2)]), (52, 0, MOVE))
+        self.assertEqual(MinimaxAI.get_action_key(piece, [(6, 4), (5, 4)]), (52, 1, SACRIFICE))
+
+    def test_alpha_beta_same_evaluation_as_minimax(self):
+        """Test if the pruning doesn't change the evaluation of the MiniMax algorithm."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        ai = MinimaxAI(2, quiescence_depth=0)
+        evaluation, best_board = ai.play_minimax(game.get_board(), ai.initial_depth, SPQR_RED, game)
+        self.assertAlmostEqual(evaluation, plain_minimax(ai, game.get_board(), 2, True, game))
+        self.assertIsInstance(best_board, Board)
+        self.assertGreater(ai.stats["cutoffs"], 0)
+
+    def test_search_returns_principal_variation(self):
+        """Test if the iterative deepening returns the evaluation, the best action and the principal variation."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        ai = MinimaxAI(3)
+        evaluation, best_board, principal_variation = ai.search(game.get_board(), game)
+        self.assertEqual(len(principal_variation), 3)
+        self.assertEqual(principal_variation[0], best_board.last_action)
+        self.assertEqual(ai.initial_depth, 3)
+        ai = MinimaxAI(3, pvs=True)
+        pvs_evaluation, pvs_board, pvs_variation = ai.search(game.get_board(), game)
+        self.assertAlmostEqual(evaluation, pvs_evaluation)
+        self.assertEqual(len(pvs_variation), 3)
+
+    def test_killer_moves_and_history(self):
+        """Test if the cutoffs update the killer moves, the history heuristic and the move ordering."""
+        ai = MinimaxAI(3)
+        ai.record_cutoff((3, 1, MOVE), 1, 2, 0)
+        ai.record_cutoff((5, 6, MOVE), 1, 2, 3)
+        ai.record_cutoff((5, 6, MOVE), 2, 1, 0)
+        self.assertEqual(ai.killer_moves[1], [(5, 6, MOVE), (3, 1, MOVE)])
+        self.assertEqual(ai.history[(5, 6, MOVE)], 5)
+        self.assertEqual(ai.stats["cutoffs"], 3)
+        self.assertAlmostEqual(ai.first_move_cutoff_rate(), 2 / 3)
+        self.assertGreater(ai.get_action_priority((5, 6, MOVE), 1), ai.get_action_priority((3, 1, MOVE), 1))
+        self.assertGreater(ai.get_action_priority((3, 1, MOVE), 1), ai.get_action_priority((0, 0, MOVE), 1))
+
+        board = Board(CELTIC_GREEN)
+        ai.killer_moves[0] = [(4, 6, MOVE)]
+        first_board = ai.simulate_all_valid_actions(board, SPQR_RED, 0)[0]
+        self.assertEqual(first_board.last_action, (4, 6, MOVE))
+
+    def test_tactical_actions(self):
+        """Test if only the sacrifices and the goal-row threats are extended by the quiescence search."""
+        board = create_empty_board(CELTIC_GREEN, [(0, 0, SPQR_RED, 2), (3, 3, SPQR_RED, 1), (4, 3, CELTIC_GREEN, 2),
+                                                  (2, 6, CELTIC_GREEN, 2), (6, 0, CELTIC_GREEN, 2)])
+        self.assertTrue(MinimaxAI.is_tactical_action(board, board.get_piece(4, 3), [(4, 3), (3, 3)]))
+        self.assertTrue(MinimaxAI.is_tactical_action(board, board.get_piece(2, 6), [(1, 6), (0, 6)]))
+        self.assertFalse(MinimaxAI.is_tactical_action(board, board.get_piece(6, 0), [(5, 0), (4, 0)]))
+        self.assertFalse(MinimaxAI.is_tactical_action(board, board.get_piece(0, 0), [(1, 0), (2, 0)]))
+
+    def test_quiescence_sees_goal_row_threat(self):
+        """Test if the quiescence search sees a win beyond the horizon that the static evaluation misses."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        game.board = create_empty_board(CELTIC_GREEN, [(0, 0, SPQR_RED, 2), (0, 7, SPQR_RED, 2),
+                                                       (2, 4, CELTIC_GREEN, 2), (6, 0, CELTIC_GREEN, 2)])
+        ai = MinimaxAI(1)
+        evaluation = ai.quiescence(game.board, ai.quiescence_depth, False, game, float('-inf'), float('inf'), 1)
+        self.assertEqual(evaluation, -WIN_SCORE + 2)
+        ai = MinimaxAI(1, quiescence_depth=0)
+        evaluation = ai.quiescence(game.board, ai.quiescence_depth, False, game, float('-inf'), float('inf'), 1)
+        self.assertEqual(evaluation, game.board.evaluate())
+
+    def test_terminal_score(self):
+        """Test if the fastest wins and the slowest losses are preferred."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        self.assertGreater(MinimaxAI.get_terminal_score(SPQR_RED, game, 1),
+                           MinimaxAI.get_terminal_score(SPQR_RED, game, 3))
+        self.assertLess(MinimaxAI.get_terminal_score(CELTIC_GREEN, game, 1),
+                        MinimaxAI.get_terminal_score(CELTIC_GREEN, game, 3))
+
+if __name__ == '__main__':
+    unittest.main()
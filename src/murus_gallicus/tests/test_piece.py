@@ -1,6 +1,7 @@
 import unittest
 from src.murus_gallicus.piece import Piece
-from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN
+from copy import deepcopy
+from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN, RED_SIDE, GREEN_SIDE, SQUARE_SIZE
 
 class TestPiece(unittest.TestCase):
     """Class of Unit Tests to check bugs in the Piece Class."""
@@ -39,5 +40,26 @@ class TestPiece(unittest.TestCase):
         self.assertIsInstance(piece, Piece)
         self.assertEqual(piece.stack_size, 2)
 
+    def test_piece_compact_representation(self):
+        """Test if a piece only stores small int codes, and computes its pixel position when asked."""
+        piece = Piece(2, 5, SPQR_RED)
+        self.assertFalse(hasattr(piece, "__dict__"))
+        self.assertEqual(piece.side, RED_SIDE)
+        self.assertEqual(Piece(2, 5, CELTIC_GREEN).side, GREEN_SIDE)
+        self.assertEqual(piece.x, SQUARE_SIZE * 5 + SQUARE_SIZE // 2)
+        piece.move(4, 1)
+        self.assertEqual(piece.calculate_window_position(),
+                         (SQUARE_SIZE * 1 + SQUARE_SIZE // 2, SQUARE_SIZE * 4 + SQUARE_SIZE // 2))
+
+    def test_piece_deepcopy(self):
+        """Test if a copied piece is independent from the original one."""
+        piece = Piece(0, 2, CELTIC_GREEN)
+        piece_copy = deepcopy(piece)
+        piece_copy.become_wall()
+        piece_copy.move(1, 3)
+        self.assertEqual((piece.row, piece.col, piece.stack_size), (0, 2, 2))
+        self.assertEqual((piece_copy.row, piece_copy.col, piece_copy.stack_size), (1, 3, 1))
+        self.assertEqual(piece_copy.color, CELTIC_GREEN)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from src.murus_gallicus.tracing import Tracer
+from src.murus_gallicus.board import Board
+from src.murus_gallicus.game import Game
+from src.murus_gallicus.minimax import MinimaxAI
+from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN, WINDOW
+
+class TestTracing(unittest.TestCase):
+    """Class of Unit Tests to check bugs in the Tracer Class."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_chrome_trace_records_traced_methods(self):
+        """Test if the chrome mode writes trace events of the search and restores the traced methods."""
+        original_evaluate = Board.evaluate
+        game = Game(WINDOW, CELTIC_GREEN)
+        ai = MinimaxAI(2)
+        with Tracer(self.path, "chrome", sample_every=1):
+            ai.play_minimax(game.get_board(), ai.initial_depth, SPQR_RED, game)
+        self.assertIs(Board.evaluate, original_evaluate)
+        with open(self.path) as trace_file:
+            events = json.load(trace_file)["traceEvents"]
+        names = {event["name"] for event in events}
+        self.assertEqual(names, {"play_minimax", "simulate_all_valid_actions", "get_valid_actions",
+                                 "evaluate", "check_winner"})
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+
+    def test_chrome_trace_sampling(self):
+        """Test if only a sample of the calls is recorded, except the outermost search call."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        ai = MinimaxAI(2)
+        with Tracer(self.path, "chrome", sample_every=1000) as tracer:
+            ai.play_minimax(game.get_board(), ai.initial_depth, SPQR_RED, game)
+        roots = [event for event in tracer.events if event["name"] == "play_minimax"]
+        self.assertEqual(len(roots), 1)
+        self.assertLess(len(tracer.events), 10)
+
+    def test_collapsed_stacks(self):
+        """Test if the collapsed mode writes flamegraph lines of the search."""
+        game = Game(WINDOW, CELTIC_GREEN)
+        ai = MinimaxAI(2)
+        with Tracer(self.path, "collapsed", interval=0.0005):
+            ai.play_minimax(game.get_board(), ai.initial_depth, SPQR_RED, game)
+        with open(self.path) as trace_file:
+            lines = trace_file.read().splitlines()
+        self.assertGreater(len(lines), 0)
+        stacks = []
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            stacks.append(stack)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("play_minimax" in stack for stack in stacks))
+
+    def test_unknown_mode(self):
+        """Test if an unknown tracing mode is refused."""
+        with self.assertRaises(ValueError):
+            Tracer(self.path, "unknown")
+
+if __name__ == '__main__':
+    unittest.main()
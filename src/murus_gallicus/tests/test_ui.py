@@ -1,7 +1,14 @@
+import gc
+import random
+import tracemalloc
 import unittest
 import pygame
+from src.murus_gallicus import ui as ui_module
 from src.murus_gallicus.ui import UIRender
-from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN, ICON_PATH
+from src.murus_gallicus.minimax import MinimaxAI
+from src.murus_gallicus.piece import Piece
+from src.murus_gallicus.constants import SPQR_RED, CELTIC_GREEN, ICON_PATH, WINDOW, BLUE, CLEAR_BLUE, P_2_P, \
+    MENU_SCENE, COLOR_SCENE, GAME_SCENE, GAME_OVER_SCENE
 
 class TestUI(unittest.TestCase):
     """Class of Unit Tests to check bugs in the UI Class."""
@@ -35,5 +42,85 @@ class TestUI(unittest.TestCase):
         self.assertEqual(row, 0)
         self.assertEqual(col, 0)
 
+    def test_fonts_and_texts_are_cached(self):
+        """Test if the fonts and the rendered texts are created once and then reused."""
+        ui = UIRender(TestUI.image_path)
+        self.assertIs(ui.get_font(40), ui.get_font(40))
+        text = ui.render_text("Gauls", 40, CELTIC_GREEN)
+        self.assertIs(ui.render_text("Gauls", 40, CELTIC_GREEN), text)
+        self.assertIsNot(ui.render_text("Gauls", 40, SPQR_RED), text)
+        ui.display_title(WINDOW, 70, "Py Murus Gallicus", SPQR_RED, (400, 100))
+        ui.button(WINDOW, 40, "Romans", CLEAR_BLUE, (400, 300), BLUE)
+        ui.button(WINDOW, 40, "Romans", CLEAR_BLUE, (400, 300), BLUE)
+        self.assertEqual(len(ui.fonts), 2)
+        self.assertLessEqual(len(ui.text_surfaces), 5)
+
+    def test_wait_events_in_idle_mode(self):
+        """Test if the idle mode returns the pending events, or no event after the timeout."""
+        ui = UIRender(TestUI.image_path)
+        default_timeout = ui_module.IDLE_TIMEOUT
+        ui_module.IDLE_TIMEOUT = 10
+        try:
+            pygame.event.clear()
+            self.assertEqual(ui.wait_events(), [])
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT, value=1))
+            events = ui.wait_events()
+            self.assertEqual([event.type for event in events], [pygame.USEREVENT])
+        finally:
+            ui_module.IDLE_TIMEOUT = default_timeout
+
+    def play_restarted_game(self, ui, rng):
+        """Plays headlessly a short game through the scenes of the GUI, until the restart button is clicked."""
+        ui.choose_player_color(P_2_P)
+        ui.start_game(P_2_P, rng.choice([SPQR_RED, CELTIC_GREEN]))
+        game = ui.game
+        ai = MinimaxAI(1)
+        for ply in range(4):
+            ui.step([])
+            color = game.board.bottom_player_color if ply % 2 else game.board.top_opponent_color
+            game.ai_move(rng.choice(ai.simulate_all_valid_actions(game.board, color)))
+        # The bottom player reaches the top of the board
+        game.board.board_grid[0][0] = Piece(0, 0, game.board.bottom_player_color)
+        while ui.scene == GAME_SCENE:
+            ui.step([])
+        ui.step([])
+        ui.show_menu()
+        ui.step([])
+
+    def test_scenes_transitions(self):
+        """Test if the buttons actions switch the active scene, and if the game is freed when it is over."""
+        ui = UIRender(TestUI.image_path)
+        self.assertEqual(ui.scene, MENU_SCENE)
+        ui.choose_player_color(P_2_P)
+        self.assertEqual(ui.scene, COLOR_SCENE)
+        ui.start_game(P_2_P, CELTIC_GREEN)
+        self.assertEqual(ui.scene, GAME_SCENE)
+        ui.game.board.board_grid[0][0] = Piece(0, 0, CELTIC_GREEN)
+        ui.step([])
+        self.assertEqual(ui.scene, GAME_OVER_SCENE)
+        self.assertEqual(ui.winner_color, CELTIC_GREEN)
+        self.assertIsNone(ui.game)
+        ui.step([pygame.event.Event(pygame.QUIT)])
+        self.assertFalse(ui.run)
+
+    def test_soak_restarted_games_memory_stays_flat(self):
+        """Test if hundreds of restarted games neither grow the memory nor the stack."""
+        ui = UIRender(TestUI.image_path)
+        rng = random.Random(0)
+        for warmup in range(20):
+            self.play_restarted_game(ui, rng)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            for game in range(300):
+                self.play_restarted_game(ui, rng)
+            gc.collect()
+            end_memory = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(ui.scene, MENU_SCENE)
+        self.assertLess(end_memory - start_memory, 64 * 1024)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,203 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from .board import Board
+from .game import Game
+from .minimax import MinimaxAI
+
+# Methods wrapped by the tracer : (class, method name)
+TRACED_METHODS = (
+    (MinimaxAI, "play_minimax"),
+    (MinimaxAI, "simulate_all_valid_actions"),
+    (Board, "get_valid_actions"),
+    (Board, "evaluate"),
+    (Board, "check_winner"),
+    (Game, "check_if_over"),
+)
+CHROME = "chrome"
+COLLAPSED = "collapsed"
+
+
+class Tracer:
+    """
+    A class to record where the Minimax AI spends its thinking time.
+
+    ...
+
+    Two opt-in modes are available :
+    - "chrome" wraps the traced methods and writes sampled spans as Chrome trace-event JSON
+      (to open with chrome://tracing or https://ui.perfetto.dev) ;
+    - "collapsed" runs a sampling thread which periodically reads the stack of the searching thread,
+      and writes collapsed stacks ("a;b;c count") ready for flamegraph.pl or speedscope.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file where the trace is written.
+    mode : str
+        Tracing mode : "chrome" or "collapsed".
+    sample_every : int
+        In "chrome" mode, only one call out of sample_every is recorded for each traced method
+        (the outermost play_minimax calls are always recorded).
+    interval : float
+        In "collapsed" mode, time in seconds between two stack samples.
+    events : list of dict
+        Chrome trace events recorded so far.
+    stacks : collections.Counter
+        Collapsed stacks recorded so far, with their number of samples.
+
+    Methods
+    -------
+    install()
+        Starts tracing : wraps the traced methods or starts the sampling thread.
+    uninstall()
+        Stops tracing and restores the traced methods.
+    write()
+        Writes the recorded trace into the output file.
+    """
+
+    def __init__(self, path, mode=COLLAPSED, sample_every=10, interval=0.001):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the file where the trace is written.
+        mode : str
+            Tracing mode : "chrome" or "collapsed".
+        sample_every : int
+            In "chrome" mode, records one call out of sample_every for each traced method.
+        interval : float
+            In "collapsed" mode, time in seconds between two stack samples.
+        """
+        if mode not in (CHROME, COLLAPSED):
+            raise ValueError("Unknown tracing mode : {}".format(mode))
+        self.path = path
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.interval = interval
+        self.events = []
+        self.stacks = Counter()
+        self._originals = {}
+        self._calls = Counter()
+        self._root_depth = 0
+        self._thread_id = None
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        self.write()
+        return False
+
+    def install(self):
+        """
+        Starts tracing : wraps the traced methods or starts the sampling thread.
+        """
+        if self.mode == CHROME:
+            if self._originals:
+                return
+            for cls, name in TRACED_METHODS:
+                original = cls.__dict__[name]
+                self._originals[(cls, name)] = original
+                setattr(cls, name, self._wrap(original, name))
+        else:
+            if self._sampler is not None:
+                return
+            self._thread_id = threading.get_ident()
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_stacks, daemon=True)
+            self._sampler.start()
+
+    def uninstall(self):
+        """
+        Stops tracing and restores the traced methods.
+        """
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals = {}
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def write(self):
+        """
+        Writes the recorded trace into the output file.
+        """
+        with open(self.path, "w") as trace_file:
+            if self.mode == CHROME:
+                json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, trace_file)
+            else:
+                for stack, count in self.stacks.most_common():
+                    trace_file.write("{} {}\n".format(stack, count))
+
+    def _wrap(self, function, name):
+        """
+        Wraps a traced method so that a sample of its calls is recorded as Chrome "complete" events.
+
+        Parameters
+        ----------
+        function : function
+            Traced method.
+        name : str
+            Name of the traced method.
+
+        Returns
+        -------
+        traced_function : function
+            Wrapper of the traced method.
+        """
+        is_root = name == "play_minimax"
+        process_id = os.getpid()
+
+        @functools.wraps(function)
+        def traced_function(*args, **kwargs):
+            if is_root:
+                self._root_depth += 1
+            self._calls[name] += 1
+            sampled = (is_root and self._root_depth == 1) or self._calls[name] % self.sample_every == 0
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if sampled:
+                    end = time.perf_counter()
+                    self.events.append({"name": name, "cat": "ai", "ph": "X", "pid": process_id,
+                                        "tid": threading.get_ident(),
+                                        "ts": start * 1e6, "dur": (end - start) * 1e6})
+                if is_root:
+                    self._root_depth -= 1
+
+        return traced_function
+
+    def _sample_stacks(self):
+        """
+        Periodically samples the stack of the traced thread and counts the collapsed stacks.
+        """
+        own_filename = os.path.abspath(__file__)
+        package_dir = os.path.dirname(own_filename)
+        while not self._stop_sampling.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.abspath(code.co_filename)
+                if filename == own_filename:
+                    pass
+                elif filename.startswith(package_dir):
+                    stack.append(code.co_name)
+                elif os.path.basename(filename) == "copy.py":
+                    # Collapse the recursive deepcopy frames into a single one
+                    if not stack or stack[-1] != "copy.deepcopy":
+                        stack.append("copy.deepcopy")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
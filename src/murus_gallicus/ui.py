@@ -1,9 +1,15 @@
+import contextlib
+import time
+from collections import deque
 import pygame
 from .constants import FPS, HEIGHT, WIDTH, SQUARE_SIZE, WINDOW
-from .constants import BLACK, WHITE, CLEAR_BLUE, BLUE, SOFT_YELLOW, \
+from .constants import BLACK, CLEAR_BLUE, BLUE, SOFT_YELLOW, \
     CELTIC_GREEN, DARK_GREEN, SPQR_RED, DARK_RED, AI_MINIMAX_DEPTH, P_2_P, P_2_Minimax, ICON_PATH
+from .constants import AI_TRACE_PATH, AI_TRACE_MODE, AI_PVS, FRAME_TIMES_LENGTH, IDLE_MODE, IDLE_TIMEOUT
+from .constants import MENU_SCENE, COLOR_SCENE, GAME_SCENE, GAME_OVER_SCENE
 from .game import Game
 from .minimax import MinimaxAI
+from .tracing import Tracer
 pygame.init()
 
 class UIRender:
@@ -22,6 +28,22 @@ class UIRender:
         Game mode : Player vs Player, Player vs MiniMax etc...
     bottom_player_color :
         RGB numbers of the bottom player color, like (255,255,255)
+    fonts : dict
+        Loaded fonts, by font size.
+    text_surfaces : dict
+        Rendered texts and button variants, by (text, font size, color).
+    frame_times : collections.deque
+        Durations in seconds of the work done for the last frames, to monitor the cost of each screen.
+    scene : str
+        Active scene : MENU_SCENE, COLOR_SCENE, GAME_SCENE or GAME_OVER_SCENE.
+    redraw : bool
+        Indicates if the active scene has to be drawn again at the next frame.
+    game : None or Game
+        Game of the game scene, freed when the game is over.
+    winner_color : int or tuple of int
+        RGB color of the winner of the last game.
+    tracer : None or Tracer
+        Tracer of the AI thinking time in the game scene.
 
     Methods
     -------
@@ -29,20 +51,36 @@ class UIRender:
         Sets the pygame window icon.
     get_row_col_from_mouse(pos)
         Retrieves the row and column of the cell from the mouse position.
-    display_game_over(winner_color)
-        Displays the game over menu / screen.
-    display_title(window, font, text, color, position)
+    wait_events()
+        Retrieves the pending events, waiting for the next one in idle mode.
+    get_font(font_size)
+        Retrieves the default font of the given size, loading it the first time it is asked.
+    render_text(text, font_size, color)
+        Retrieves the rendered surface of a text, rendering it the first time it is asked.
+    display_title(window, font_size, text, color, position)
         Displays a title / text on the graphical window.
-    button(window, font, text, color, position, hover_color, event=None, action=None, *actions_args)
+    button(window, font_size, text, color, position, hover_color, event=None, action=None, *actions_args)
         Displays a clickable button on the graphical window.
     launch()
-        Starts the graphical window and displays the first screen / menu / page.
-    choose_player_color()
+        Starts the graphical window and runs the loop over the active scene.
+    change_scene(scene)
+        Makes the input scene the active one, and frees the game when leaving the game scenes.
+    step(events=None)
+        Runs one frame of the active scene : draws it if needed, lets the AI play, then handles the events.
+    draw_scene()
+        Draws the active scene on the graphical window.
+    handle_event(event)
+        Handles an input event in the active scene.
+    show_menu()
+        Displays the first screen / menu where you have to choose the game mode.
+    choose_player_color(game_mode)
         Displays the screen / menu where you have to choose your side/color.
     display_game_over(winner_color)
         Displays the screen / menu where the winner of the game is shown and where you can choose to play again.
-    start_game(bottom_player_color)
+    start_game(game_mode, bottom_player_color)
         Displays the in game screen / menu.
+    play_ai()
+        Lets the Minimax AI play its action in the game scene.
     """
     def __init__(self, image_path=ICON_PATH):
         """
@@ -60,6 +98,14 @@ class UIRender:
         self.game_mode = "UNKNOWN"
         self.bottom_player_color = 0
         self.top_player_color = 0
+        self.fonts = {}
+        self.text_surfaces = {}
+        self.frame_times = deque(maxlen=FRAME_TIMES_LENGTH)
+        self.scene = MENU_SCENE
+        self.redraw = True
+        self.game = None
+        self.winner_color = 0
+        self.tracer = None
         import os
         print(os.getcwd() )
         print(image_path)
@@ -100,36 +146,79 @@ class UIRender:
         col = x // SQUARE_SIZE
         return row, col
 
-    def display_game_over(self, winner_color):
+    def wait_events(self):
+        """
+        Retrieves the pending events. In idle mode, blocks until the next event (or IDLE_TIMEOUT milliseconds)
+        instead of polling at FPS, so that an idle screen costs almost no CPU.
+
+        Returns
+        -------
+        events : list of pygame.event.Event
+            The events to handle, empty if none happened before the timeout.
+        """
+        if IDLE_MODE:
+            event = pygame.event.wait(IDLE_TIMEOUT)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+        # Still limit the frame rate when many events happen, like mouse motions
+        self.clock.tick(FPS)
+        return events
+
+    def get_font(self, font_size):
         """
-        Displays the game over menu / screen.
+        Retrieves the default font of the given size, loading it the first time it is asked.
 
         Parameters
         ----------
-        winner_color : tuple of int
-            RGB color of the winner of the game, like (255, 255, 255).
+        font_size : int
+            Size of the font.
+
+        Returns
+        -------
+        font : pygame.font.Font
+            The default pygame font of the given size.
         """
-        pygame.init()
-        font = pygame.font.Font(None, 70)
-        if winner_color == SPQR_RED:
-            text = font.render("Romans win !", True, BLUE)
-        elif winner_color == CELTIC_GREEN:
-            text = font.render("Gauls win !", True, BLUE)
-        else:
-            text = font.render("!!! Error : romans nor gauls have won !!!", True, WHITE)
-        text_rect = text.get_rect(center=(WIDTH / 2, HEIGHT / 4))
-        WINDOW.blit(text, text_rect)
-        pygame.display.update()
+        font = self.fonts.get(font_size)
+        if font is None:
+            font = pygame.font.Font(None, font_size)
+            self.fonts[font_size] = font
+        return font
 
-    def display_title(self, window, font, text, color, position):
+    def render_text(self, text, font_size, color):
+        """
+        Retrieves the rendered surface of a text, rendering it the first time it is asked.
+
+        Parameters
+        ----------
+        text : str
+            Text to render.
+        font_size : int
+            Size of the font to use for the text.
+        color : tuple of int
+            RGB color of the text.
+
+        Returns
+        -------
+        text_surface : pygame.Surface
+            The rendered text.
+        """
+        text_surface = self.text_surfaces.get((text, font_size, color))
+        if text_surface is None:
+            text_surface = self.get_font(font_size).render(text, True, color)
+            self.text_surfaces[(text, font_size, color)] = text_surface
+        return text_surface
+
+    def display_title(self, window, font_size, text, color, position):
         """
         Displays a title / text on the graphical window.
         Parameters
         ----------
         window : pygame.Surface
             The pygame graphical window defined among the constants.
-        font : pygame.font.Font
-            The font to use for the text to display.
+        font_size : int
+            The size of the font to use for the text to display.
         text : str
             Text to display.
         color :
@@ -137,12 +226,11 @@ class UIRender:
         position : tuple of int
             Position of the text on the graphical window.
         """
-        pygame.init()
-        text = font.render(text, True, color)
+        text = self.render_text(text, font_size, color)
         text_rect = text.get_rect(center=position)
         window.blit(text, text_rect)
 
-    def button(self, window, font, text, color, position, hover_color, event=None, action=None, *actions_args):
+    def button(self, window, font_size, text, color, position, hover_color, event=None, action=None, *actions_args):
         """
         Displays a clickable button on the graphical window.
 
@@ -150,8 +238,8 @@ class UIRender:
         ----------
         window : pygame.Surface
             The pygame graphical window defined among the constants.
-        font : pygame.font.Font
-            The font to use for the text to display.
+        font_size : int
+            The size of the font to use for the text to display.
         text : str
             Text to display.
         color :
@@ -171,76 +259,159 @@ class UIRender:
         -------
 
         """
-        text_render = font.render(text, True, color)
-        text_render_hover = font.render(text, True, hover_color)
+        text_render = self.render_text(text, font_size, color)
         text_rect = text_render.get_rect(center=position)
-        window.blit(text_render, text_rect)
 
         if text_rect.collidepoint(pygame.mouse.get_pos()):  # Check if the button has been clicked
-            window.blit(text_render_hover, text_rect)
+            window.blit(self.render_text(text, font_size, hover_color), text_rect)
             # Check if event is of type pygame.event and if action is a function that can be executed
             if isinstance(event, pygame.event.EventType) and event.button == 1 and callable(action):
                 action(*actions_args)
+        else:
+            window.blit(text_render, text_rect)
 
     def launch(self):
         """
         Starts the graphical window and displays the first screen / menu / page.
+        The GUI then runs one flat loop over the active scene : the menus and the game are scenes,
+        and the buttons switch the active scene instead of starting a new nested loop.
         """
         pygame.init()
+        self.show_menu()
         while self.run:
+            self.step()
+        pygame.quit()
 
-            self.clock.tick(FPS)
-            WINDOW.fill(SOFT_YELLOW)
-
-            font = pygame.font.Font(None, 70)
-            self.display_title(WINDOW, font, "Py Murus Gallicus", SPQR_RED, (WIDTH / 2, HEIGHT / 8))
-
-            font = pygame.font.Font(None, 40)
-            self.display_title(WINDOW, font, "Please choose your game mode :", BLACK, (WIDTH / 2, HEIGHT / 4))
-
-            self.button(WINDOW, font, P_2_P, CLEAR_BLUE, (WIDTH / 2, 1.5 * HEIGHT / 4), BLUE, None, None,
-                        None)
-            self.button(WINDOW, font, P_2_Minimax, CLEAR_BLUE, (WIDTH / 2, 2 * HEIGHT / 4), BLUE, None, None,
-                        None)
+    def change_scene(self, scene):
+        """
+        Makes the input scene the active one, and frees the game when leaving the game scenes.
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.run = False
+        Parameters
+        ----------
+        scene : str
+            The new active scene : MENU_SCENE, COLOR_SCENE, GAME_SCENE or GAME_OVER_SCENE.
+        """
+        if scene in (MENU_SCENE, COLOR_SCENE):
+            self.game = None
+            self.tracer = None
+        self.scene = scene
+        self.redraw = True
 
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    self.button(WINDOW, font, P_2_P, CLEAR_BLUE, (WIDTH / 2, 1.5 * HEIGHT / 4), BLUE,
-                                event, self.choose_player_color, P_2_P)
-                    self.button(WINDOW, font, P_2_Minimax, CLEAR_BLUE, (WIDTH / 2, 2 * HEIGHT / 4), BLUE,
-                                event, self.choose_player_color, P_2_Minimax)
+    def step(self, events=None):
+        """
+        Runs one frame of the active scene : draws it if needed, lets the AI play, then handles the events.
 
-            pygame.display.update()
+        Parameters
+        ----------
+        events : None or list of pygame.event.Event
+            Events to handle ; if None, the pending events are retrieved (and waited for in idle mode).
+        """
+        if self.redraw:
+            frame_start = time.perf_counter()
+            self.draw_scene()
+            self.frame_times.append(time.perf_counter() - frame_start)
+            # Drawing the game scene may have ended the game
+            if self.scene == GAME_OVER_SCENE and self.redraw:
+                return
+
+        # The board is drawn before the AI thinks, and again as soon as it has played
+        if self.scene == GAME_SCENE and self.game_mode == P_2_Minimax and self.game.turn == self.top_player_color:
+            self.play_ai()
+            self.redraw = True
+            return
+
+        if events is None:
+            events = self.wait_events()
+        self.redraw = len(events) > 0 or not IDLE_MODE
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.run = False
+            else:
+                self.handle_event(event)
 
-    def choose_player_color(self, game_mode):
+    def draw_scene(self):
         """
-        Displays the screen / menu where you have to choose your side/color.
+        Draws the active scene on the graphical window.
         """
-        pygame.init()
-        while self.run:
-            self.clock.tick(FPS)
+        self.redraw = False
+        if self.scene == MENU_SCENE:
             WINDOW.fill(SOFT_YELLOW)
+            self.display_title(WINDOW, 70, "Py Murus Gallicus", SPQR_RED, (WIDTH / 2, HEIGHT / 8))
+            self.display_title(WINDOW, 40, "Please choose your game mode :", BLACK, (WIDTH / 2, HEIGHT / 4))
+            self.button(WINDOW, 40, P_2_P, CLEAR_BLUE, (WIDTH / 2, 1.5 * HEIGHT / 4), BLUE)
+            self.button(WINDOW, 40, P_2_Minimax, CLEAR_BLUE, (WIDTH / 2, 2 * HEIGHT / 4), BLUE)
+            pygame.display.update()
 
-            font = pygame.font.Font(None, 40)
-            self.display_title(WINDOW, font, "Please choose your team :", BLACK, (WIDTH / 2, HEIGHT / 4))
+        elif self.scene == COLOR_SCENE:
+            WINDOW.fill(SOFT_YELLOW)
+            self.display_title(WINDOW, 40, "Please choose your team :", BLACK, (WIDTH / 2, HEIGHT / 4))
+            self.button(WINDOW, 40, "Gauls", CELTIC_GREEN, (WIDTH / 2, 1.5 * HEIGHT / 4), DARK_GREEN)
+            self.button(WINDOW, 40, "Romans", SPQR_RED, (WIDTH / 2, 2 * HEIGHT / 4), DARK_RED)
+            pygame.display.update()
 
-            self.button(WINDOW, font, "Gauls", CELTIC_GREEN, (WIDTH / 2, 1.5 * HEIGHT / 4), DARK_GREEN, None, None)
-            self.button(WINDOW, font, "Romans", SPQR_RED, (WIDTH / 2, 2 * HEIGHT / 4), DARK_RED, None, None)
+        elif self.scene == GAME_SCENE:
+            self.game.update()
+            self.game.check_if_over()
+            if self.game.is_over:
+                self.display_game_over(CELTIC_GREEN if self.game.winner == CELTIC_GREEN else SPQR_RED)
+
+        elif self.scene == GAME_OVER_SCENE:
+            self.button(WINDOW, 70, "Click here to restart", CLEAR_BLUE, (WIDTH / 2, 3.5 * HEIGHT / 8), BLUE)
+            if self.winner_color == SPQR_RED:
+                self.display_title(WINDOW, 70, "Romans win !", SPQR_RED, (WIDTH / 2, 2.5 * HEIGHT / 8))
+            elif self.winner_color == CELTIC_GREEN:
+                self.display_title(WINDOW, 70, "Gauls win !", CELTIC_GREEN, (WIDTH / 2, 2.5 * HEIGHT / 8))
+            else:
+                self.display_title(WINDOW, 70, "!!! Error : romans nor gauls have winned !!!", BLACK,
+                                   (WIDTH / 2, 2.5 * HEIGHT / 8))
+            pygame.display.update()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.run = False
+    def handle_event(self, event):
+        """
+        Handles an input event in the active scene.
 
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    self.button(WINDOW, font, 'Gauls', CELTIC_GREEN, (WIDTH / 2, 1.5 * HEIGHT / 4), DARK_GREEN,
-                                event, self.start_game, game_mode, CELTIC_GREEN)
-                    self.button(WINDOW, font, 'Romans', SPQR_RED, (WIDTH / 2, 2 * HEIGHT / 4), DARK_RED,
-                                event, self.start_game, game_mode, SPQR_RED)
+        Parameters
+        ----------
+        event : pygame.event.Event
+            Pygame event like mouse click or move.
+        """
+        if self.scene == GAME_SCENE:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                row, col = self.get_row_col_from_mouse(pygame.mouse.get_pos())
+                self.game.select(row, col)
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.scene == MENU_SCENE:
+                self.button(WINDOW, 40, P_2_P, CLEAR_BLUE, (WIDTH / 2, 1.5 * HEIGHT / 4), BLUE,
+                            event, self.choose_player_color, P_2_P)
+                self.button(WINDOW, 40, P_2_Minimax, CLEAR_BLUE, (WIDTH / 2, 2 * HEIGHT / 4), BLUE,
+                            event, self.choose_player_color, P_2_Minimax)
+            elif self.scene == COLOR_SCENE:
+                self.button(WINDOW, 40, "Gauls", CELTIC_GREEN, (WIDTH / 2, 1.5 * HEIGHT / 4), DARK_GREEN,
+                            event, self.start_game, self.game_mode, CELTIC_GREEN)
+                self.button(WINDOW, 40, "Romans", SPQR_RED, (WIDTH / 2, 2 * HEIGHT / 4), DARK_RED,
+                            event, self.start_game, self.game_mode, SPQR_RED)
+            elif self.scene == GAME_OVER_SCENE:
+                self.button(WINDOW, 70, "Click here to restart", CLEAR_BLUE, (WIDTH / 2, 3.5 * HEIGHT / 8),
+                            BLUE, event, self.show_menu)
+
+    def show_menu(self):
+        """
+        Displays the first screen / menu where you have to choose the game mode.
+        """
+        self.change_scene(MENU_SCENE)
 
-            pygame.display.update()
+    def choose_player_color(self, game_mode):
+        """
+        Displays the screen / menu where you have to choose your side/color.
+
+        Parameters
+        ----------
+        game_mode : str
+            Game mode : Player vs Player, Player vs MiniMax etc...
+        """
+        self.game_mode = game_mode
+        self.change_scene(COLOR_SCENE)
 
     def display_game_over(self, winner_color):
         """
@@ -251,31 +422,9 @@ class UIRender:
         winner_color : tuple of int
             RGB color of the winner of the game, like (255, 255, 255).
         """
-        pygame.init()
-        while self.run:
-            self.clock.tick(FPS)
-
-            font = pygame.font.Font(None, 70)
-            self.button(WINDOW, font, "Click here to restart", CLEAR_BLUE, (WIDTH / 2, 3.5 * HEIGHT / 8),
-                        BLUE, None, None)
-
-            if winner_color == SPQR_RED:
-                self.display_title(WINDOW, font, "Romans win !", SPQR_RED, (WIDTH / 2, 2.5 * HEIGHT / 8))
-            elif winner_color == CELTIC_GREEN:
-                self.display_title(WINDOW, font, "Gauls win !", CELTIC_GREEN, (WIDTH / 2, 2.5 * HEIGHT / 8))
-            else:
-                self.display_title(WINDOW, font, "!!! Error : romans nor gauls have winned !!!", BLACK,
-                                   (WIDTH / 2, 2.5 * HEIGHT / 8))
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.run = False
-
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    self.button(WINDOW, font, "Click here to restart", CLEAR_BLUE, (WIDTH / 2, 3.5 * HEIGHT / 8),
-                                BLUE, event, self.launch)
-
-            pygame.display.update()
+        self.winner_color = winner_color
+        self.game = None
+        self.change_scene(GAME_OVER_SCENE)
 
     def start_game(self, game_mode, bottom_player_color):
         """
@@ -283,39 +432,24 @@ class UIRender:
 
         Parameters
         ----------
+        game_mode : str
+            Game mode : Player vs Player, Player vs MiniMax etc...
         bottom_player_color : tuple of int
             RGB color of the player starting bottom, like (255, 255, 255).
         """
-        pygame.init()
-        game = Game(WINDOW, bottom_player_color)
+        self.game_mode = game_mode
+        self.game = Game(WINDOW, bottom_player_color)
         self.set_window_icon(ICON_PATH)
         self.set_bottom_player_color(bottom_player_color)
+        self.tracer = Tracer(AI_TRACE_PATH, AI_TRACE_MODE) if AI_TRACE_PATH else contextlib.nullcontext()
+        self.change_scene(GAME_SCENE)
 
-        while self.run:
-            self.clock.tick(FPS)
-
-            if game_mode == P_2_Minimax and game.turn == self.top_player_color:
-                    ai = MinimaxAI(AI_MINIMAX_DEPTH)
-                    eval_value, new_board = ai.play_minimax(game.get_board(), ai.initial_depth, self.top_player_color, game)
-                    game.ai_move(new_board)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.run = False
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    row, col = self.get_row_col_from_mouse(pos)
-                    game.select(row, col)
-
-            game.update()
-
-            game.check_if_over()
-            if game.is_over:
-                if game.winner == CELTIC_GREEN:
-                    self.display_game_over(CELTIC_GREEN)
-                else:
-                    self.display_game_over(SPQR_RED)
-
-
-        pygame.quit()
+    def play_ai(self):
+        """
+        Lets the Minimax AI play its action in the game scene.
+        """
+        ai = MinimaxAI(AI_MINIMAX_DEPTH, pvs=AI_PVS)
+        with self.tracer:
+            eval_value, new_board = ai.play_minimax(self.game.get_board(), ai.initial_depth,
+                                                    self.top_player_color, self.game)
+        self.game.ai_move(new_board)